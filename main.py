@@ -4,11 +4,7 @@ from src.analysis import Analyzer
 
 DB_PATH = "data/msgstore.db"  # Fixed path to the .db file
 
-def main(conversation_id):
-    # Load data from the .db file
-    data_loader = DataLoader(DB_PATH)
-    messages = data_loader.load_messages(conversation_id)  # Load messages from the specified conversation
-
+def print_stats(messages, conversation_id):
     # Perform analysis
     analyzer = Analyzer(messages, conversation_id)
     
@@ -20,10 +16,24 @@ def main(conversation_id):
     for stat, value in stats.items():
         print(f"{stat}: {value}")
 
+def main(conversation_ids):
+    # Load data from the .db file
+    data_loader = DataLoader(DB_PATH)
+
+    if len(conversation_ids) == 1:
+        conversation_id = conversation_ids[0]
+        messages = data_loader.load_messages(conversation_id)  # Load messages from the specified conversation
+        print_stats(messages, conversation_id)
+        return
+
+    # Several conversations: each one is analyzed as soon as it is loaded, while the others keep loading
+    for conversation_id, messages in data_loader.load_messages_batch(conversation_ids):
+        print_stats(messages, conversation_id)
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python main.py conversation_id")
+        print("Usage: python main.py conversation_id [conversation_id ...]")
         sys.exit(1)
 
-    conversation_id = int(sys.argv[1])  # Get the conversation ID from the command line
-    main(conversation_id)
+    conversation_ids = [int(arg) for arg in sys.argv[1:]]  # Get the conversation IDs from the command line
+    main(conversation_ids)
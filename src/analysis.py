@@ -1,7 +1,147 @@
-from collections import Counter
-from datetime import datetime, timedelta
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import cached_property
+from heapq import nlargest
+from itertools import filterfalse
+from operator import itemgetter
+import calendar
 import re
-from .constants import LANGUAGE_CONNECTORS, INSULT_WORDS, LOVE_WORDS, SPECIAL_DATES
+import numpy as np
+from .constants import LANGUAGE_CONNECTORS, INSULT_WORDS, LOVE_WORDS
+
+_EMOJI_RE = re.compile("[\U00010000-\U0010ffff]", flags=re.UNICODE)
+_WORD_RE = re.compile(r'\w+')
+# The greeting patterns are matched against lowercased text, so they are written in lowercase without re.IGNORECASE
+_MORNING_RE = re.compile(r'\b(bom dia[a-z]*|bd)\b')
+_NIGHT_RE = re.compile(r'\b(boa noite[a-z]*|bn)\b')
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels below then run as plain Python
+    def njit(*args, **kwargs):
+        return lambda function: function
+
+@njit(cache=True)
+def _response_stats(ts, from_me):
+    """Sums the gaps (in seconds) between consecutive messages, split by the sender of the later message.
+
+    Returns (sum_me, n_me, sum_them, n_them, sum_all, n_all).
+    """
+    sum_me = sum_them = sum_all = 0.0
+    n_me = n_them = 0
+    for i in range(1, len(ts)):
+        response_time = (ts[i] - ts[i - 1]) / 1000  # Convert to seconds
+        sum_all += response_time
+        if from_me[i]:
+            sum_me += response_time
+            n_me += 1
+        else:
+            sum_them += response_time
+            n_them += 1
+    return sum_me, n_me, sum_them, n_them, sum_all, n_me + n_them
+
+# Compile the kernel at import time rather than on the first analysis
+_response_stats(np.zeros(2, dtype=np.int64), np.zeros(2, dtype=np.bool_))
+
+def _to_local_ms(ts):
+    """Shifts epoch milliseconds to local-time milliseconds, matching datetime.fromtimestamp."""
+    # UTC offsets change on 15-minute boundaries (some zones switch at :30 or :45 past the UTC hour),
+    # so the offset is looked up once per distinct 15-minute bucket
+    quarters, inverse = np.unique(ts // 900_000, return_inverse=True)
+    offsets = np.array(
+        [datetime.fromtimestamp(quarter * 900).astimezone().utcoffset().total_seconds() * 1000 for quarter in quarters.tolist()],
+        dtype=np.int64,
+    )
+    return ts + offsets[inverse.reshape(-1)]
+
+def _bucket_counts(buckets):
+    """Counts each distinct integer bucket."""
+    values, counts = np.unique(buckets, return_counts=True)
+    return Counter(dict(zip(values.tolist(), counts.tolist())))
+
+# Time buckets are integer keys; these format them only when a statistic is output
+def _format_day(day):
+    return str(np.datetime64(day, 'D'))
+
+def _format_month(month):
+    return str(np.datetime64(month, 'M'))
+
+def _format_weekday(weekday):
+    return calendar.day_name[weekday]
+
+# Statistics in Analyzer.analyze whose result is a written file
+_FILE_STATISTICS = (
+    "Most Common Words",
+    "Messages per Hour",
+    "Most Used Emoji",
+    "Love Words Count",
+    "Insult Words Count",
+    "Monthly Message Frequency Variation",
+    "Daily Message Frequency Variation",
+    "Weekday Message Frequency Variation",
+)
+
+_TokenCounts = namedtuple("_TokenCounts", ["total_words", "words", "love", "insult"])
+_TextScan = namedtuple("_TextScan", ["total_emojis", "emojis", "morning", "night", "longest_index"])
+
+LONGEST_MESSAGE_MAX_LENGTH = 300  # Longer texts are usually pasted content rather than typed messages
+
+_TOKEN_CHUNK = 10_000  # Messages tokenized per regex call in _count_words
+
+def _count_words(texts, texts_lower):
+    """Counts total words over the original texts plus the word, love-word and insult-word counters over the lowercased texts.
+
+    Texts are joined a chunk at a time so one findall call and C-level Counter updates replace the
+    per-message Python loop; \\w+ never matches across the newline separator, so the tokens are the same.
+    The total is taken from the original texts because lowercasing can split a word (e.g. 'İ' lowercases to 'i' plus
+    a combining dot).
+    """
+    total_words = 0
+    word_counter = Counter()
+    love_counter = Counter()
+    insult_counter = Counter()
+    for start in range(0, len(texts_lower), _TOKEN_CHUNK):
+        total_words += len(_WORD_RE.findall('\n'.join(filter(None, texts[start:start + _TOKEN_CHUNK]))))
+        words = _WORD_RE.findall('\n'.join(texts_lower[start:start + _TOKEN_CHUNK]))
+        word_counter.update(filterfalse(LANGUAGE_CONNECTORS.__contains__, words))
+        love_counter.update(filter(LOVE_WORDS.__contains__, words))
+        insult_counter.update(filter(INSULT_WORDS.__contains__, words))
+    return _TokenCounts(total_words, word_counter, love_counter, insult_counter)
+
+def _scan_texts(texts, texts_lower):
+    """Counts emojis and 'bom dia'/'boa noite' messages and finds the longest message in a single pass over the texts."""
+    emoji_counter = Counter()
+    total_emojis = 0
+    morning_count = 0
+    night_count = 0
+    longest_index = None
+    longest_length = 0
+
+    for index, (text, text_lower) in enumerate(zip(texts, texts_lower)):
+        if not text_lower:
+            continue
+
+        length = len(text)
+        if longest_length < length < LONGEST_MESSAGE_MAX_LENGTH:
+            longest_index, longest_length = index, length
+
+        # Emojis are outside the ASCII range, so ASCII-only messages (the common case) skip the scan.
+        # The original text is scanned: lowercasing would fold cased astral characters (e.g. '𐐀' to '𐐨')
+        if not text.isascii():
+            emojis = _EMOJI_RE.findall(text)
+            total_emojis += len(emojis)
+            emoji_counter.update(emojis)
+
+        # Substring checks (a plain C search) rule out almost every message; the regex only confirms word boundaries.
+        # Every match of the case-sensitive patterns contains one of the checked substrings, so the prefilter never
+        # rejects a message the regex would count
+        if ('bd' in text_lower or 'bom dia' in text_lower) and _MORNING_RE.search(text_lower):
+            morning_count += 1
+        if ('bn' in text_lower or 'boa noite' in text_lower) and _NIGHT_RE.search(text_lower):
+            night_count += 1
+
+    return _TextScan(total_emojis, emoji_counter, morning_count, night_count, longest_index)
 
 class Analyzer:
     def __init__(self, messages, conversation_id):
@@ -12,32 +152,78 @@ class Analyzer:
 
     @staticmethod
     def write_to_file(data, file_name):
+        # Build the whole file first so it is written with a single call
+        content = ''.join(f"{key}\t{value}\n" for key, value in data.items())
         with open(file_name, 'w', encoding='utf-8') as file:
-            for key, value in data.items():
-                file.write(f"{key}\t{value}\n")
+            file.write(content)
         return file_name
-    
+
+    @cached_property
+    def _from_me_count(self):
+        return int(self.messages.from_me.sum())
+
+    @cached_property
+    def _local_ms(self):
+        return _to_local_ms(self.messages.ts)
+
+    # Time buckets are integers: days since the epoch, hour of day, months since the epoch and weekday (Monday is 0)
+
+    @cached_property
+    def _days(self):
+        return self._local_ms // 86_400_000
+
+    @cached_property
+    def _day_counter(self):
+        return _bucket_counts(self._days)
+
+    @cached_property
+    def _hour_counter(self):
+        return _bucket_counts((self._local_ms // 3_600_000) % 24)
+
+    @cached_property
+    def _month_counter(self):
+        return _bucket_counts(self._local_ms.astype('datetime64[ms]').astype('datetime64[M]').astype(np.int64))
+
+    @cached_property
+    def _weekday_counter(self):
+        return _bucket_counts((self._days - 4) % 7)  # 1970-01-01 was a Thursday
+
+    @cached_property
+    def _msg_type_counts(self):
+        # Message counts for every type in one pass; minlength covers every type code read by the statistics.
+        # Negative codes (including the -1 used for NULL types) match no statistic and would make bincount fail
+        msg_type = self.messages.msg_type
+        return np.bincount(msg_type[msg_type >= 0], minlength=128)
+
+    @cached_property
+    def _token_counts(self):
+        return _count_words(self.messages.texts, self.messages.texts_lower)
+
+    @cached_property
+    def _text_scan(self):
+        return _scan_texts(self.messages.texts, self.messages.texts_lower)
+
     def total_messages(self):
         """Returns the total number of messages in the conversation."""
-        return len(self.messages)
+        return len(self.messages.ts)
 
     def messages_by_sender(self):
         """Counts messages sent by you and by the other participant."""
-        from_me_count = sum(1 for message in self.messages if message.from_me)
-        from_them_count = len(self.messages) - from_me_count
+        from_me_count = self._from_me_count
+        from_them_count = len(self.messages.ts) - from_me_count
         return {"from_me": from_me_count, "from_them": from_them_count}
 
     def average_messages_per_day(self):
         """Calculates the average number of messages sent per day for general, you, and your partner."""
-        if not self.messages:
+        if not len(self.messages.ts):
             return {"general": 0, "me": 0, "them": 0}
 
-        start_date = datetime.fromtimestamp(self.messages[0].timestamp / 1000)
-        end_date = datetime.fromtimestamp(self.messages[-1].timestamp / 1000)
+        start_date = datetime.fromtimestamp(self.messages.ts[0] / 1000)
+        end_date = datetime.fromtimestamp(self.messages.ts[-1] / 1000)
         days = (end_date - start_date).days or 1
 
-        total_messages = len(self.messages)
-        my_messages = sum(1 for message in self.messages if message.from_me)
+        total_messages = len(self.messages.ts)
+        my_messages = self._from_me_count
         their_messages = total_messages - my_messages
 
         avg_general = total_messages / days
@@ -52,29 +238,39 @@ class Analyzer:
 
     def day_with_most_messages(self):
         """Finds the day on which the most messages were sent."""
-        day_counts = Counter(datetime.fromtimestamp(message.timestamp / 1000).strftime('%Y-%m-%d') for message in self.messages)
-        most_common_day = day_counts.most_common(1)
-        return most_common_day[0] if most_common_day else None
+        day_counts = self._day_counter
+        if not day_counts:
+            return None
+        day, count = max(day_counts.items(), key=itemgetter(1))
+        return (_format_day(day), count)
 
     def day_with_least_messages(self):
         """Finds the day on which the least messages were sent, excluding days with 0 or 2 messages."""
-        day_counts = Counter(datetime.fromtimestamp(message.timestamp / 1000).strftime('%Y-%m-%d') for message in self.messages)
-        
+        day_counts = self._day_counter
+
         # Filter out days with 0 or 2 messages
         filtered_day_counts = {day: count for day, count in day_counts.items() if count not in [0, 2]}
 
         # Find the day with the least number of messages
         if filtered_day_counts:
             least_common_day = min(filtered_day_counts, key=filtered_day_counts.get)
-            return (least_common_day, filtered_day_counts[least_common_day])
+            return (_format_day(least_common_day), filtered_day_counts[least_common_day])
         else:
             return None
 
+    def days_without_messages(self):
+        """Number of days between the first and last message on which no message was sent."""
+        day_counts = self._day_counter
+        if not day_counts:
+            return 0
+
+        present_days = np.fromiter(day_counts, dtype=np.int64, count=len(day_counts))
+        all_days = np.arange(present_days.min(), present_days.max() + 1)
+        return int((~np.isin(all_days, present_days)).sum())
+
     def most_common_words(self, num_words=30):
         """Identifies the most common words used in the conversation."""
-        words = re.findall(r'\w+', ' '.join(message.text_data.lower() for message in self.messages if message.text_data))
-        filtered_words = [word for word in words if word not in LANGUAGE_CONNECTORS]
-        common_words = Counter(filtered_words).most_common(num_words)
+        common_words = nlargest(num_words, self._token_counts.words.items(), key=itemgetter(1))
 
         # Prepare data for writing to file
         common_words_data = {word: count for word, count in common_words}
@@ -85,12 +281,11 @@ class Analyzer:
 
     def total_words_sent(self):
         """Total number of words sent in the conversation."""
-        return sum(len(re.findall(r'\w+', message.text_data)) for message in self.messages if message.text_data)
+        return self._token_counts.total_words
 
     def messages_per_hour(self):
         """Number of messages sent per hour."""
-        hours = [datetime.fromtimestamp(message.timestamp / 1000).hour for message in self.messages]
-        hour_counts = Counter(hours)
+        hour_counts = self._hour_counter
 
         # Preparing the data for writing to file
         hour_counts_data = {f"{hour}:00": count for hour, count in hour_counts.items()}
@@ -101,14 +296,11 @@ class Analyzer:
 
     def number_of_emojis(self):
         """Total number of emojis used in the conversation."""
-        emoji_pattern = re.compile("[\U00010000-\U0010ffff]", flags=re.UNICODE)
-        return sum(len(emoji_pattern.findall(message.text_data)) for message in self.messages if message.text_data)
+        return self._text_scan.total_emojis
 
     def most_used_emojis(self, top_n=15):
         """Returns a dictionary of the top 'n' most frequently used emojis and their counts."""
-        emoji_pattern = re.compile("[\U00010000-\U0010ffff]", flags=re.UNICODE)
-        emojis = [emoji for message in self.messages if message.text_data for emoji in emoji_pattern.findall(message.text_data)]
-        top_emojis = Counter(emojis).most_common(top_n)
+        top_emojis = nlargest(top_n, self._text_scan.emojis.items(), key=itemgetter(1))
 
         # Preparing the data for writing to file
         top_emojis_data = {emoji: count for emoji, count in top_emojis}
@@ -119,60 +311,49 @@ class Analyzer:
 
     def photo_messages_count(self):
         """Number of photos shared in the conversation."""
-        return sum(1 for message in self.messages if message.message_type == 1 or message.message_type == 42)
+        type_counts = self._msg_type_counts
+        return int(type_counts[1] + type_counts[42])
 
     def sticker_messages_count(self):
         """Number of stickers shared in the conversation."""
-        return sum(1 for message in self.messages if message.message_type == 20)
-    
+        return int(self._msg_type_counts[20])
+
     def audio_messages_count(self):
         """Number of audio messages shared."""
-        return sum(1 for message in self.messages if message.message_type == 2)
+        return int(self._msg_type_counts[2])
 
     def video_messages_count(self):
         """Number of videos shared."""
-        return sum(1 for message in self.messages if message.message_type == 3)
+        return int(self._msg_type_counts[3])
 
     def call_count(self):
         """Number of whatsapp calls made."""
-        return sum(1 for message in self.messages if message.message_type == 90)
-    
+        return int(self._msg_type_counts[90])
+
     def location_shared_count(self):
         """Number of times location was shared."""
-        return sum(1 for message in self.messages if message.message_type == 5 or message.message_type == 16)
-    
-    def good_morning_night_messages(self):
-        """Frequency of various forms of 'Bom dia' and 'Boa noite' messages, including shorthands."""
-        morning_pattern = re.compile(r'\b(Bom dia[a-z]*|bd)\b', re.IGNORECASE)
-        night_pattern = re.compile(r'\b(Boa noite[a-z]*|bn)\b', re.IGNORECASE)
+        type_counts = self._msg_type_counts
+        return int(type_counts[5] + type_counts[16])
 
-        morning_count = sum(bool(morning_pattern.search(message.text_data)) for message in self.messages if message.text_data)
-        night_count = sum(bool(night_pattern.search(message.text_data)) for message in self.messages if message.text_data)
+    def longest_message(self):
+        """The longest message under LONGEST_MESSAGE_MAX_LENGTH characters, as a message id and text."""
+        index = self._text_scan.longest_index
+        if index is None:
+            return None
+        return {"message_id": int(self.messages.message_id[index]), "text": self.messages.texts[index]}
 
-        return {"bom_dia": morning_count, "boa_noite": night_count}
+    def good_morning_night_messages(self):
+        """Frequency of various forms of 'Bom dia' and 'Boa noite' messages, including shorthands."""
+        text_scan = self._text_scan
+        return {"bom_dia": text_scan.morning, "boa_noite": text_scan.night}
 
     def average_response_time(self):
         """Calculate the average response time between messages for general, you, and your partner."""
-        response_times = []
-        my_response_times = []
-        their_response_times = []
-        last_message = None
+        sum_me, n_me, sum_them, n_them, sum_all, n_all = _response_stats(self.messages.ts, self.messages.from_me)
 
-        for message in self.messages:
-            if last_message is not None:
-                response_time = (message.timestamp - last_message.timestamp) / 1000  # Convert to seconds
-                response_times.append(response_time)
-
-                if message.from_me:
-                    my_response_times.append(response_time)
-                else:
-                    their_response_times.append(response_time)
-
-            last_message = message
-
-        avg_response_time = sum(response_times) / len(response_times) if response_times else 0
-        avg_my_response_time = sum(my_response_times) / len(my_response_times) if my_response_times else 0
-        avg_their_response_time = sum(their_response_times) / len(their_response_times) if their_response_times else 0
+        avg_response_time = float(sum_all / n_all) if n_all else 0
+        avg_my_response_time = float(sum_me / n_me) if n_me else 0
+        avg_their_response_time = float(sum_them / n_them) if n_them else 0
 
         return {
             "average_response_time_general": avg_response_time,
@@ -182,76 +363,77 @@ class Analyzer:
 
     def love_words_count(self):
         """Number of messages expressing love."""
-        love_word_counts = Counter()
-        for message in self.messages:
-            if message.text_data:
-                words = message.text_data.lower().split()
-                for word in words:
-                    if word in LOVE_WORDS:
-                        love_word_counts[word] += 1
-
         file_name = f"love-word-counts-{self.conversation_id}.txt"
-        Analyzer.write_to_file(dict(love_word_counts), file_name)
+        Analyzer.write_to_file(dict(self._token_counts.love), file_name)
         return file_name
 
     def insult_words_count(self):
         """Number of messages with insult words."""
-        insult_word_counts = Counter()
-        for message in self.messages:
-            if message.text_data:
-                words = message.text_data.lower().split()
-                for word in words:
-                    if word in INSULT_WORDS:
-                        insult_word_counts[word] += 1
         file_name = f"insult-word-counts-{self.conversation_id}.txt"
-        Analyzer.write_to_file(dict(insult_word_counts), file_name)
+        Analyzer.write_to_file(dict(self._token_counts.insult), file_name)
         return file_name
 
     def weekday_frequency_variation(self):
         """Analyze how message count varies by days of the week."""
-        weekday_counts = Counter(datetime.fromtimestamp(message.timestamp / 1000).strftime('%A') for message in self.messages)
         file_name = f"weekday-frequency-{self.conversation_id}.txt"
+        weekday_counts = {_format_weekday(weekday): count for weekday, count in self._weekday_counter.items()}
         Analyzer.write_to_file(weekday_counts, file_name)
         return file_name
 
     def monthly_frequency_variation(self):
         """Analyze how message count varies each month."""
-        monthly_counts = Counter(datetime.fromtimestamp(message.timestamp / 1000).strftime('%Y-%m') for message in self.messages)
         file_name = f"monthly-frequency-{self.conversation_id}.txt"
+        monthly_counts = {_format_month(month): count for month, count in self._month_counter.items()}
         Analyzer.write_to_file(monthly_counts, file_name)
         return file_name
 
     def daily_frequency_variation(self):
         """Analyze how message count varies each day."""
-        daily_counts = Counter(datetime.fromtimestamp(message.timestamp / 1000).strftime('%Y-%m-%d') for message in self.messages)
         file_name = f"daily-frequency-{self.conversation_id}.txt"
+        daily_counts = {_format_day(day): count for day, count in self._day_counter.items()}
         Analyzer.write_to_file(daily_counts, file_name)
         return file_name
 
+    def _compute_intermediates(self):
+        """Fills every cached intermediate result so statistics running on worker threads only read them."""
+        for name in ("_from_me_count", "_day_counter", "_hour_counter", "_month_counter", "_weekday_counter",
+                     "_msg_type_counts", "_token_counts", "_text_scan"):
+            getattr(self, name)
+
     def analyze(self):
-        return {
-            "Total Messages": self.total_messages(),
-            "Messages by Sender": self.messages_by_sender(),
-            "Average Messages per Day": self.average_messages_per_day(),
-            "Day with Most Messages": self.day_with_most_messages(),
-            "Day with Least Messages": self.day_with_least_messages(),
-            "Most Common Words": self.most_common_words(),
-            "Total Words Sent": self.total_words_sent(),
-            "Messages per Hour": self.messages_per_hour(),
-            "Number of Emojis": self.number_of_emojis(),
-            "Most Used Emoji": self.most_used_emojis(),
-            "Photo Messages Count": self.photo_messages_count(),
-            "Sticker Messages Count": self.sticker_messages_count(),
-            "Video Messages Count": self.video_messages_count(),
-            "Audio Messages Count": self.audio_messages_count(),
-            "Location Messages Count": self.location_shared_count(),
-            "Call Count": self.call_count(),
-            "Good Morning/Night Messages": self.good_morning_night_messages(),
-            "Average Response Time": self.average_response_time(),
-            "Love Words Count": self.love_words_count(),
-            "Insult Words Count": self.insult_words_count(),
-            "Monthly Message Frequency Variation": self.monthly_frequency_variation(),
-            "Daily Message Frequency Variation": self.daily_frequency_variation(),
-            "Weekday Message Frequency Variation": self.weekday_frequency_variation(),
+        """Runs every statistic over the conversation; shared intermediate results are computed once and cached."""
+        statistics = {
+            "Total Messages": self.total_messages,
+            "Messages by Sender": self.messages_by_sender,
+            "Average Messages per Day": self.average_messages_per_day,
+            "Day with Most Messages": self.day_with_most_messages,
+            "Day with Least Messages": self.day_with_least_messages,
+            "Days without Messages": self.days_without_messages,
+            "Most Common Words": self.most_common_words,
+            "Total Words Sent": self.total_words_sent,
+            "Messages per Hour": self.messages_per_hour,
+            "Number of Emojis": self.number_of_emojis,
+            "Most Used Emoji": self.most_used_emojis,
+            "Photo Messages Count": self.photo_messages_count,
+            "Sticker Messages Count": self.sticker_messages_count,
+            "Video Messages Count": self.video_messages_count,
+            "Audio Messages Count": self.audio_messages_count,
+            "Location Messages Count": self.location_shared_count,
+            "Call Count": self.call_count,
+            "Longest Message": self.longest_message,
+            "Good Morning/Night Messages": self.good_morning_night_messages,
+            "Average Response Time": self.average_response_time,
+            "Love Words Count": self.love_words_count,
+            "Insult Words Count": self.insult_words_count,
+            "Monthly Message Frequency Variation": self.monthly_frequency_variation,
+            "Daily Message Frequency Variation": self.daily_frequency_variation,
+            "Weekday Message Frequency Variation": self.weekday_frequency_variation,
         }
-        
\ No newline at end of file
+
+        # The file-producing statistics are independent and mostly sort, format and write, so they run on a
+        # thread pool while the remaining statistics are computed on this thread
+        self._compute_intermediates()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {name: executor.submit(statistics[name]) for name in _FILE_STATISTICS}
+            return {name: futures[name].result() if name in futures else statistic()
+                    for name, statistic in statistics.items()}
@@ -1,14 +1,15 @@
 # Constants for analysis exclusions and keyword lists
+# Keyword lists are frozensets so they can be matched against a message's tokens with hashed lookups
 
 # Common language connectors in Portuguese to be excluded from analysis
-LANGUAGE_CONNECTORS = {
+LANGUAGE_CONNECTORS = frozenset({
     # Put here common language connectors
-}
+})
 
-LOVE_WORDS = {
+LOVE_WORDS = frozenset({
     # Put here common love words
-}
+})
 
-INSULT_WORDS = {
+INSULT_WORDS = frozenset({
     # Put here common insult words
-}
+})
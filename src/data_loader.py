@@ -1,23 +1,68 @@
 # Projeto6/src/data_loader.py
 
 import sqlite3
-from .models.message import Message
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .models.message_batch import MessageBatch
+
+# Read-oriented settings applied to every connection (they do not persist in the database file)
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MiB page cache
+    "PRAGMA mmap_size=268435456",  # 256 MiB memory-mapped I/O
+)
 
 class DataLoader:
     def __init__(self, db_path):
         self.db_path = db_path
+        self._prepare()
+
+    def _prepare(self):
+        """One-time setup: switch the database to WAL and index the base table of message_view by chat and time.
+
+        Both steps write to the database; on a read-only or locked file they are skipped and queries fall back to a scan.
+        """
+        with closing(self._connect()) as conn:
+            for statement in ("PRAGMA journal_mode=WAL",
+                              "CREATE INDEX IF NOT EXISTS idx_msg_chat_ts ON message(chat_row_id, timestamp)"):
+                try:
+                    conn.execute(statement)
+                except sqlite3.OperationalError:
+                    pass
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
 
     def load_messages(self, conversation_id):
+        # Only the columns used by the analysis are fetched; see MessageBatch.from_rows for the order
         query = """
-                SELECT * 
+                SELECT _id, from_me, timestamp, message_type, text_data
                 FROM message_view 
                 WHERE chat_row_id = ?
+                ORDER BY timestamp
                 """
         rows = self.execute_query(query, (conversation_id,))
-        return [Message.from_row(row) for row in rows]
+        return MessageBatch.from_rows(rows)
+
+    def load_messages_batch(self, conversation_ids, max_workers=4):
+        """Loads several conversations concurrently, yielding (conversation_id, MessageBatch) as each one finishes.
+
+        Each load runs on its own worker thread with its own connection; sqlite3 releases the GIL while
+        SQLite reads pages, so the queries overlap with each other and with the caller's processing.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self.load_messages, conversation_id): conversation_id
+                       for conversation_id in conversation_ids}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
 
     def execute_query(self, query, params):
-        with sqlite3.connect(self.db_path) as conn:
+        """Yields the rows of the query as the cursor produces them, without materializing the result set."""
+        with closing(self._connect()) as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            return cursor.fetchall()
+            yield from cursor
@@ -0,0 +1,34 @@
+from collections import namedtuple
+
+import numpy as np
+
+
+class MessageBatch(namedtuple("MessageBatch", ["message_id", "ts", "from_me", "msg_type", "texts", "texts_lower"])):
+    """Columnar (structure of arrays) view of a conversation's messages.
+
+    message_id, ts, from_me and msg_type are parallel numpy arrays; texts is a plain list of strings (or None)
+    and texts_lower holds each text lowercased once at load time ('' for messages without text).
+    """
+    __slots__ = ()
+
+    @staticmethod
+    def from_rows(rows):
+        """Create a MessageBatch from (message_id, from_me, timestamp, message_type, text_data) rows, consuming them once."""
+        message_ids, timestamps, senders, message_types, texts, texts_lower = [], [], [], [], [], []
+        for message_id, from_me, timestamp, message_type, text_data in rows:
+            message_ids.append(message_id)
+            timestamps.append(timestamp)
+            senders.append(from_me)
+            message_types.append(message_type if message_type is not None else -1)  # -1 marks a NULL type
+            texts.append(text_data)
+            texts_lower.append(text_data.lower() if text_data else '')
+
+        return MessageBatch(
+            message_id=np.array(message_ids, dtype=np.int64),
+            ts=np.array(timestamps, dtype=np.int64),
+            from_me=np.array(senders, dtype=np.bool_),
+            # int16 rather than int8: WhatsApp message types are not guaranteed to stay below 128
+            msg_type=np.array(message_types, dtype=np.int16),
+            texts=texts,
+            texts_lower=texts_lower,
+        )